@@ -0,0 +1,174 @@
+import math
+
+import pandas as pd
+
+# Accounts that post on a schedule rather than as community members
+KNOWN_BOTS = {'AutoModerator', 'sneakpeekbot', 'RemindMeBot', 'WikiSummarizerBot', 'RepostSleuthBot'}
+BOT_NAME_SUFFIXES = ('Bot', '_bot', '-bot')
+BOT_STICKIED_SHARE = 0.5  # authors whose posts are mostly stickied are treated as bots
+# Placeholders for deleted accounts - many different people, so never indexed as one author
+UNATTRIBUTED_AUTHORS = {'[deleted]', '[removed]'}
+
+
+def engagement_score(score, num_comments):
+    # Same weighting as calculate_engagement_metrics
+    return (score * 0.7) + (num_comments * 0.3)
+
+
+class AuthorStats:
+    """
+    Running per-author statistics, updated in O(1) per post
+    """
+    __slots__ = ('author', 'post_count', 'stickied_count', 'first_post_utc', 'last_post_utc',
+                 'engagement_mean', '_engagement_m2', 'engagement_min', 'engagement_max', 'engagement_buckets')
+
+    def __init__(self, author):
+        self.author = author
+        self.post_count = 0
+        self.stickied_count = 0
+        self.first_post_utc = None
+        self.last_post_utc = None
+        self.engagement_mean = 0.0
+        self._engagement_m2 = 0.0
+        self.engagement_min = None
+        self.engagement_max = None
+        # Histogram of engagement by power-of-two bucket (0: <1, 1: 1-2, 2: 2-4, ...)
+        self.engagement_buckets = {}
+
+    def add(self, created_utc, engagement, is_stickied=False):
+        self.post_count += 1
+        self.stickied_count += bool(is_stickied)
+
+        if created_utc is not None:
+            if self.first_post_utc is None or created_utc < self.first_post_utc:
+                self.first_post_utc = created_utc
+            if self.last_post_utc is None or created_utc > self.last_post_utc:
+                self.last_post_utc = created_utc
+
+        # Welford's online mean/variance
+        delta = engagement - self.engagement_mean
+        self.engagement_mean += delta / self.post_count
+        self._engagement_m2 += delta * (engagement - self.engagement_mean)
+        self.engagement_min = engagement if self.engagement_min is None else min(self.engagement_min, engagement)
+        self.engagement_max = engagement if self.engagement_max is None else max(self.engagement_max, engagement)
+        bucket = 0 if engagement < 1 else int(math.log2(engagement)) + 1
+        self.engagement_buckets[bucket] = self.engagement_buckets.get(bucket, 0) + 1
+
+    @property
+    def engagement_std(self):
+        return math.sqrt(self._engagement_m2 / self.post_count) if self.post_count else 0.0
+
+    @property
+    def cadence_hours(self):
+        """
+        Average time between this author's posts (None with fewer than two posts)
+        """
+        if self.post_count < 2 or self.first_post_utc is None:
+            return None
+        return (self.last_post_utc - self.first_post_utc) / (self.post_count - 1) / 3600
+
+    def to_dict(self):
+        return {
+            'author': self.author,
+            'post_count': self.post_count,
+            'stickied_count': self.stickied_count,
+            'first_post_utc': self.first_post_utc,
+            'last_post_utc': self.last_post_utc,
+            'cadence_hours': self.cadence_hours,
+            'engagement_mean': round(self.engagement_mean, 2),
+            'engagement_std': round(self.engagement_std, 2),
+            'engagement_min': self.engagement_min,
+            'engagement_max': self.engagement_max
+        }
+
+
+class AuthorIndex:
+    """
+    Incremental per-author index maintained as posts are ingested
+
+    Lookups such as is_bot() and is_prolific() are O(1) dict/set probes, so
+    analyses can drop bots or prolific authors without rescanning the frame.
+    """
+
+    def __init__(self, known_bots=KNOWN_BOTS):
+        self.known_bots = set(known_bots)
+        self.authors = {}
+        self._seen_ids = set()
+
+    def add(self, author, created_utc, score, num_comments, is_stickied=False, post_id=None):
+        """
+        Ingest one post; posts seen before (same id) or without a real author are ignored
+        """
+        if author is None or pd.isna(author) or author in UNATTRIBUTED_AUTHORS:
+            return
+        if post_id is not None:
+            if post_id in self._seen_ids:
+                return
+            self._seen_ids.add(post_id)
+        stats = self.authors.get(author)
+        if stats is None:
+            stats = self.authors[author] = AuthorStats(author)
+        stats.add(created_utc, engagement_score(score, num_comments), is_stickied)
+
+    def add_frame(self, df):
+        """
+        Ingest every row of a collected DataFrame (e.g. one loaded from CSV)
+        """
+        if 'created_utc' in df.columns:
+            created = df['created_utc'].tolist()
+        elif 'created_time' in df.columns:
+            created = (pd.to_datetime(df['created_time']).astype('int64') / 1e9).tolist()
+        else:
+            created = [None] * len(df)
+        stickied = df['is_stickied'].tolist() if 'is_stickied' in df.columns else [False] * len(df)
+        ids = df['id'].tolist() if 'id' in df.columns else [None] * len(df)
+
+        for author, created_utc, score, num_comments, is_stickied, post_id in zip(
+                df['author'].tolist(), created, df['score'].tolist(), df['num_comments'].tolist(),
+                stickied, ids):
+            self.add(author, created_utc, score, num_comments, is_stickied, post_id)
+
+    def get(self, author):
+        return self.authors.get(author)
+
+    def is_bot(self, author):
+        if author in self.known_bots or str(author).endswith(BOT_NAME_SUFFIXES):
+            return True
+        stats = self.authors.get(author)
+        return stats is not None and stats.stickied_count / stats.post_count >= BOT_STICKIED_SHARE
+
+    def is_prolific(self, author, max_posts):
+        stats = self.authors.get(author)
+        return stats is not None and stats.post_count > max_posts
+
+    def excluded_authors(self, exclude_bots=True, max_posts=None):
+        """
+        Set of authors to drop from an analysis
+        """
+        return {author for author in self.authors
+                if (exclude_bots and self.is_bot(author))
+                or (max_posts is not None and self.is_prolific(author, max_posts))}
+
+    def filter_frame(self, df, exclude_bots=True, max_posts=None):
+        """
+        Drop posts by bots and/or authors with more than max_posts posts
+        """
+        if df.empty or (not exclude_bots and max_posts is None):
+            return df
+        excluded = df['author'].isin(self.excluded_authors(exclude_bots, max_posts))
+        if excluded.any():
+            print(f"🤖 Excluded {excluded.sum()} posts from "
+                  f"{df.loc[excluded, 'author'].nunique()} bot/prolific authors")
+        return df[~excluded]
+
+    def top_authors(self, n=10):
+        return sorted(self.authors.values(), key=lambda s: s.post_count, reverse=True)[:n]
+
+    def to_frame(self):
+        return pd.DataFrame([stats.to_dict() for stats in self.authors.values()])
+
+    def __contains__(self, author):
+        return author in self.authors
+
+    def __len__(self):
+        return len(self.authors)
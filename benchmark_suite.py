@@ -0,0 +1,225 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from reddit_questions import classify_posts
+from reddit_time_analysis import analyze_posting_times, calculate_engagement_metrics, collect_reddit_data_json
+from synthetic_listings import ListingDistribution, MockRedditServer, generate_frame
+
+# Configuration
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+HISTORY_FILE = os.path.join(REPO_DIR, 'benchmark_history.jsonl')  # shared by runs from any directory
+REGRESSION_THRESHOLD = 0.20  # flag anything 20% slower than the previous commit
+MAX_COLLECT_POSTS = 100_000  # a single listing page of 25k posts is already far beyond Reddit's limit
+
+BENCHMARKS = ('collect', 'engagement_metrics', 'posting_times', 'classify', 'cold_start')
+
+# CLI invocations whose process start-up time is tracked (cron runs pay this every time)
+COLD_START_COMMANDS = {
+    'cold_start_help': ['--help'],
+    'cold_start_analyze_times_help': ['analyze-times', '--help']
+}
+
+
+def current_commit():
+    """
+    Short hash of the checked-out commit, marked dirty if the tree has changes
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{commit}-dirty" if dirty else commit
+
+
+def environment():
+    """
+    Host and interpreter a run was timed on - only runs on the same ones are comparable
+    """
+    return {'python': platform.python_version(), 'machine': platform.node()}
+
+
+def time_call(func, repeat):
+    """
+    Best-of-N wall time of func(), with its stdout suppressed
+    """
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_cold_start_benchmarks(repeat=3):
+    """
+    Best-of-N wall time of fresh `python reddit_cli.py ...` processes
+    """
+    cli = os.path.join(REPO_DIR, 'reddit_cli.py')
+    results = []
+    print(f"\n🧊 Cold start")
+    for name, cli_args in COLD_START_COMMANDS.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, cli] + cli_args, capture_output=True, check=True)
+            timings.append(time.perf_counter() - start)
+        result = _result(name, 0, min(timings))
+        results.append(result)
+        print(f"   {name:<30} {result['seconds']:10.4f}s")
+    return results
+
+
+def run_benchmarks(distribution, scales, benchmarks=BENCHMARKS, repeat=3, seed=0):
+    """
+    Time each pipeline stage at each scale and return one result dict per run
+    """
+    results = []
+
+    for scale in scales:
+        print(f"\n📏 Scale: {scale:,} posts")
+        frame = generate_frame(distribution, scale, seed=seed)
+
+        if 'collect' in benchmarks:
+            if scale > MAX_COLLECT_POSTS:
+                print(f"   ⏭️  collect skipped (above MAX_COLLECT_POSTS={MAX_COLLECT_POSTS:,})")
+            else:
+                with MockRedditServer(distribution, seed=seed) as server:
+                    collect = lambda: collect_reddit_data_json('sysadmin', num_posts=scale,
+                                                               base_url=server.base_url, request_delay=0)
+                    # Warm the server's listing cache so we time the client side
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        collect()
+                    results.append(_result('collect', scale, time_call(collect, repeat)))
+
+        if 'engagement_metrics' in benchmarks:
+            results.append(_result('engagement_metrics', scale,
+                                   time_call(lambda: calculate_engagement_metrics(frame.copy()), repeat)))
+
+        engaged = calculate_engagement_metrics(frame.copy())
+
+        if 'posting_times' in benchmarks:
+            results.append(_result('posting_times', scale,
+                                   time_call(lambda: analyze_posting_times(engaged, 'sysadmin'), repeat)))
+
+        if 'classify' in benchmarks:
+            results.append(_result('classify', scale, time_call(lambda: classify_posts(frame), repeat)))
+
+        for result in results:
+            if result['scale'] == scale:
+                print(f"   {result['benchmark']:<20} {result['seconds']:10.4f}s "
+                      f"({result['posts_per_second']:,.0f} posts/s)")
+
+    return results
+
+
+def _result(benchmark, scale, seconds):
+    return {
+        'benchmark': benchmark,
+        'scale': scale,
+        'seconds': round(seconds, 6),
+        'posts_per_second': round(scale / seconds, 1) if seconds and scale else None
+    }
+
+
+def load_history(path=HISTORY_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(results, commit, path=HISTORY_FILE):
+    """
+    Append this run's results, tagged with commit and environment, to the history log
+    """
+    recorded_at = datetime.datetime.now().isoformat(timespec='seconds')
+    with open(path, 'a') as f:
+        for result in results:
+            f.write(json.dumps({'commit': commit,
+                                'recorded_at': recorded_at,
+                                **environment(),
+                                **result}) + "\n")
+
+
+def find_regressions(results, history, commit, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare against the most recent run of each benchmark/scale from another
+    commit on the same machine and Python version
+    """
+    current = environment()
+    regressions = []
+    for result in results:
+        previous = [entry for entry in history
+                    if entry['benchmark'] == result['benchmark']
+                    and entry['scale'] == result['scale']
+                    and entry['commit'] != commit
+                    and all(entry.get(key) == value for key, value in current.items())]
+        if not previous:
+            continue
+        baseline = previous[-1]
+        change = result['seconds'] / baseline['seconds'] - 1 if baseline['seconds'] else 0
+        if change > threshold:
+            regressions.append({**result, 'baseline_commit': baseline['commit'],
+                                'baseline_seconds': baseline['seconds'], 'change': change})
+    return regressions
+
+
+def main(argv=None):
+    """
+    Run the benchmark suite and report regressions against earlier commits
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Reddit analysis pipeline on synthetic listings")
+    parser.add_argument('--scales', type=lambda value: [int(s) for s in value.split(',')],
+                        default=DEFAULT_SCALES, help="comma-separated post counts (1000 to 10000000)")
+    parser.add_argument('--benchmarks', type=lambda value: value.split(','), default=list(BENCHMARKS),
+                        help=f"comma-separated subset of {','.join(BENCHMARKS)}")
+    parser.add_argument('--repeat', type=int, default=3, help="best-of-N repetitions per benchmark")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sample', help="posting-analysis CSV to draw distributions from")
+    parser.add_argument('--history', default=HISTORY_FILE)
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument('--no-record', action='store_true', help="don't append results to the history log")
+    parser.add_argument('--fail-on-regression', action='store_true', help="exit non-zero if a regression is found")
+    args = parser.parse_args(argv)
+
+    commit = current_commit()
+    print(f"🏁 Reddit pipeline benchmarks @ {commit}")
+    print("="*70)
+
+    distribution = ListingDistribution.from_csv(args.sample, seed=args.seed)
+    results = run_benchmarks(distribution, args.scales, args.benchmarks, args.repeat, args.seed)
+    if 'cold_start' in args.benchmarks:
+        results += run_cold_start_benchmarks(args.repeat)
+
+    history = load_history(args.history)
+    regressions = find_regressions(results, history, commit, args.threshold)
+    if not args.no_record:
+        append_history(results, commit, args.history)
+        print(f"\n💾 Results appended to {args.history}")
+
+    if regressions:
+        print(f"\n🐢 REGRESSIONS (> {args.threshold:.0%} slower):")
+        for r in regressions:
+            print(f"   {r['benchmark']} @ {r['scale']:,}: {r['seconds']:.4f}s vs "
+                  f"{r['baseline_seconds']:.4f}s at {r['baseline_commit']} ({r['change']:+.0%})")
+        if args.fail_on_regression:
+            return 1
+    else:
+        print("\n✅ No regressions against previous commits")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import reddit_http
+
+# Configurations worth probing - the first entries are the collectors' defaults
+DEFAULT_HOSTS = ['https://www.reddit.com', 'https://old.reddit.com']
+DEFAULT_USER_AGENTS = [
+    'python:RedditAnalyzer:v1.0.0 (by /u/External_Necessary48)',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'DataAnalyzer/1.0'
+]
+DEFAULT_ENDPOINTS = ['/r/{subreddit}/hot.json?limit=3', '/r/{subreddit}/new.json?limit=3']
+
+# The optional startup probe stays small and polite: one request per
+# host/User-Agent on a single endpoint, two at a time
+STARTUP_PROBE_ENDPOINTS = ['/r/{subreddit}/hot.json?limit=3']
+STARTUP_PROBE_ATTEMPTS = 1
+STARTUP_PROBE_WORKERS = 2
+
+_thread_state = threading.local()
+
+
+def _session():
+    """
+    One keep-alive session per worker thread (requests.Session is not thread-safe)
+    """
+    if not hasattr(_thread_state, 'session'):
+        import requests
+        _thread_state.session = requests.Session()
+    return _thread_state.session
+
+
+def _percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, round(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def probe_once(host, user_agent, endpoint, timeout=10):
+    """
+    Issue a single probe request and report status, latency and listing validity
+    """
+    import requests
+
+    url = host + endpoint
+    start = time.perf_counter()
+    try:
+        response = _session().get(url, headers={'User-Agent': user_agent}, timeout=timeout)
+        latency = time.perf_counter() - start
+        ok = False
+        if response.status_code == 200:
+            try:
+                ok = 'children' in response.json()['data']
+            except (ValueError, KeyError, TypeError):
+                pass
+        return {'host': host, 'user_agent': user_agent, 'endpoint': endpoint,
+                'status': response.status_code, 'latency': latency, 'ok': ok}
+    except requests.exceptions.RequestException as e:
+        return {'host': host, 'user_agent': user_agent, 'endpoint': endpoint,
+                'status': type(e).__name__, 'latency': time.perf_counter() - start, 'ok': False}
+
+
+def summarize_probes(probes):
+    """
+    Group probe results by (host, user agent) with latency percentiles and status counts
+    """
+    grouped = {}
+    for probe in probes:
+        grouped.setdefault((probe['host'], probe['user_agent']), []).append(probe)
+
+    summaries = []
+    for (host, user_agent), results in grouped.items():
+        latencies = sorted(r['latency'] for r in results if r['ok'])
+        successes = sum(r['ok'] for r in results)
+        summaries.append({
+            'base_url': host,
+            'user_agent': user_agent,
+            'probes': len(results),
+            'successes': successes,
+            'success_rate': successes / len(results),
+            'status_codes': dict(Counter(r['status'] for r in results)),
+            'p50': _percentile(latencies, 50),
+            'p90': _percentile(latencies, 90),
+            'p99': _percentile(latencies, 99)
+        })
+    return summaries
+
+
+def probe_configurations(hosts=None, user_agents=None, endpoints=None, subreddit='sysadmin',
+                         attempts=3, max_workers=8, timeout=10):
+    """
+    Probe every host x user agent x endpoint combination concurrently
+    """
+    hosts = hosts or DEFAULT_HOSTS
+    user_agents = user_agents or DEFAULT_USER_AGENTS
+    endpoints = [e.format(subreddit=subreddit) for e in (endpoints or DEFAULT_ENDPOINTS)]
+
+    jobs = [(host, user_agent, endpoint)
+            for _ in range(attempts)
+            for host in hosts
+            for user_agent in user_agents
+            for endpoint in endpoints]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        probes = list(executor.map(lambda job: probe_once(*job, timeout=timeout), jobs))
+
+    return summarize_probes(probes)
+
+
+def pick_best_configuration(summaries):
+    """
+    The most reliable configuration, ties broken by median latency
+    """
+    working = [s for s in summaries if s['successes']]
+    if not working:
+        return None
+    return min(working, key=lambda s: (-s['success_rate'], s['p50']))
+
+
+def print_probe_report(summaries):
+    print(f"\n📊 Probe Results:")
+    for s in sorted(summaries, key=lambda s: (-s['success_rate'], s['p50'] or float('inf'))):
+        status = "✅" if s['successes'] else "❌"
+        latency = (f"p50 {s['p50'] * 1000:.0f}ms, p90 {s['p90'] * 1000:.0f}ms, p99 {s['p99'] * 1000:.0f}ms"
+                   if s['p50'] is not None else "no successful probes")
+        print(f"   {status} {s['base_url']} | {s['user_agent'][:40]}")
+        print(f"      └── {s['successes']}/{s['probes']} ok, {latency}, statuses {s['status_codes']}")
+
+
+def run_probe_report(hosts=None, user_agents=None, endpoints=None, subreddit='sysadmin', attempts=3, **probe_options):
+    """
+    Probe every configuration, print the report and return (summaries, best configuration)
+    """
+    print("Testing Reddit's public JSON API...")
+    print("=" * 50)
+    
+    hosts = hosts or DEFAULT_HOSTS
+    user_agents = user_agents or DEFAULT_USER_AGENTS
+    endpoints = endpoints or DEFAULT_ENDPOINTS
+    
+    print(f"🧪 Probing {len(hosts)} hosts x {len(user_agents)} User-Agents x "
+          f"{len(endpoints)} endpoints, {attempts} attempts each (concurrently)")
+    
+    summaries = probe_configurations(hosts, user_agents, endpoints, subreddit=subreddit,
+                                     attempts=attempts, **probe_options)
+    print_probe_report(summaries)
+    
+    working_configs = [s for s in summaries if s['successes']]
+    
+    print(f"\n📊 Results Summary:")
+    print(f"✅ Working configurations: {len(working_configs)}")
+    print(f"❌ Failed configurations: {len(summaries) - len(working_configs)}")
+    
+    best_config = pick_best_configuration(summaries)
+    if best_config:
+        print(f"\n🎯 Use this working configuration:")
+        print(f"   Base URL: {best_config['base_url']}")
+        print(f"   User-Agent: {best_config['user_agent']}")
+    else:
+        print(f"\n❌ No working configurations found")
+    return summaries, best_config
+
+
+def is_descriptive_user_agent(user_agent):
+    """
+    True for identifying bot User-Agents, False for spoofed browser strings
+    """
+    return not user_agent.startswith('Mozilla/')
+
+
+def select_collector_config(subreddit='sysadmin', default_base_url=DEFAULT_HOSTS[0],
+                            default_user_agent=DEFAULT_USER_AGENTS[0], **probe_options):
+    """
+    Pick the fastest working base URL and User-Agent for the collectors
+
+    Only descriptive bot User-Agents are candidates, and the probe sends one
+    request per host/User-Agent. Falls back to the given defaults when nothing
+    works. Probing is skipped while recording or replaying: captures are keyed
+    on the exact URLs requested, so both modes must use the same base URL.
+    """
+    default = {'base_url': default_base_url, 'user_agent': default_user_agent}
+    if reddit_http.replaying() or reddit_http.recording():
+        return default
+
+    # Always include the caller's own defaults among the candidates
+    hosts = probe_options.pop('hosts', None) or DEFAULT_HOSTS
+    user_agents = probe_options.pop('user_agents', None) or DEFAULT_USER_AGENTS
+    hosts = [default_base_url] + [h for h in hosts if h != default_base_url]
+    user_agents = [default_user_agent] + [ua for ua in user_agents
+                                          if ua != default_user_agent and is_descriptive_user_agent(ua)]
+    probe_options.setdefault('endpoints', STARTUP_PROBE_ENDPOINTS)
+    probe_options.setdefault('attempts', STARTUP_PROBE_ATTEMPTS)
+    probe_options.setdefault('max_workers', STARTUP_PROBE_WORKERS)
+
+    print(f"🩺 Probing Reddit endpoints for the fastest working configuration...")
+    best = pick_best_configuration(probe_configurations(hosts, user_agents, subreddit=subreddit, **probe_options))
+    if best is None:
+        print(f"   ⚠️  No configuration worked - falling back to {default_base_url}")
+        return default
+
+    print(f"   ✅ Using {best['base_url']} with User-Agent '{best['user_agent']}' "
+          f"(p50 {best['p50'] * 1000:.0f}ms)")
+    return {'base_url': best['base_url'], 'user_agent': best['user_agent']}
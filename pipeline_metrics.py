@@ -0,0 +1,225 @@
+import contextlib
+import cProfile
+import datetime
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module
+    resource = None
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+
+def _peak_rss_bytes():
+    """
+    Peak resident set size of this process so far (None where unsupported)
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is bytes on macOS and KiB elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageMetrics:
+    """
+    Measurements for a single pipeline stage
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_seconds = 0.0
+        self.network_seconds = 0.0
+        self.sleep_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.requests = 0
+        self.bytes_received = 0
+        self.rows = 0
+        self.peak_memory_bytes = None
+        self.profile_file = None
+
+    def to_dict(self):
+        return {
+            'stage': self.name,
+            'wall_seconds': round(self.wall_seconds, 6),
+            'network_seconds': round(self.network_seconds, 6),
+            'sleep_seconds': round(self.sleep_seconds, 6),
+            'parse_seconds': round(self.parse_seconds, 6),
+            'requests': self.requests,
+            'bytes_received': self.bytes_received,
+            'rows': self.rows,
+            'peak_memory_bytes': self.peak_memory_bytes,
+            'profile_file': self.profile_file
+        }
+
+
+class PipelineMetrics:
+    """
+    Lightweight per-stage instrumentation for an analysis run
+
+    Wrap each stage in ``with metrics.stage('name') as stage:`` and set
+    ``stage.rows``. Requests, bytes, parse time and sleeps are reported by
+    the helpers in reddit_http while a stage is active.
+
+    Per-stage peak memory needs trace_memory=True (tracemalloc, which slows
+    the run down); otherwise only the process-wide peak RSS is reported.
+    """
+
+    def __init__(self, run_name, profiler=None, profile_stages=None,
+                 trace_memory=False, output_dir='.'):
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"profiler must be one of {', '.join(PROFILERS)}")
+        self.run_name = run_name
+        self.profiler = profiler
+        self.profile_stages = set(profile_stages) if profile_stages else None
+        self.trace_memory = trace_memory
+        self.output_dir = output_dir
+        self.started_at = datetime.datetime.now()
+        self.stages = []
+        self.current = None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Time a pipeline stage and attribute requests/bytes/rows to it
+        """
+        record = StageMetrics(name)
+        self.stages.append(record)
+        previous, self.current = self.current, record
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        profiler = self._start_profiler(name)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - start
+            self._stop_profiler(profiler, record)
+            if self.trace_memory:
+                record.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+            self.current = previous
+
+    def record_request(self, num_bytes, seconds):
+        if self.current is not None:
+            self.current.requests += 1
+            self.current.bytes_received += num_bytes
+            self.current.network_seconds += seconds
+
+    def record_parse(self, seconds):
+        if self.current is not None:
+            self.current.parse_seconds += seconds
+
+    def record_sleep(self, seconds):
+        if self.current is not None:
+            self.current.sleep_seconds += seconds
+
+    def _profiling(self, name):
+        return self.profiler is not None and (self.profile_stages is None or name in self.profile_stages)
+
+    def _start_profiler(self, name):
+        if not self._profiling(name):
+            return None
+        if self.profiler == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️  pyinstrument is not installed - skipping profile (pip install pyinstrument)")
+            return None
+        profiler = Profiler()
+        profiler.start()
+        return profiler
+
+    def _stop_profiler(self, profiler, record):
+        if profiler is None:
+            return
+        prefix = os.path.join(self.output_dir, f"{self.run_name}_{record.name}_{self.started_at:%Y%m%d_%H%M%S}")
+        if self.profiler == 'cprofile':
+            profiler.disable()
+            record.profile_file = f"{prefix}.prof"
+            profiler.dump_stats(record.profile_file)
+        else:
+            profiler.stop()
+            record.profile_file = f"{prefix}.html"
+            with open(record.profile_file, 'w') as f:
+                f.write(profiler.output_html())
+
+    def to_dict(self):
+        return {
+            'run': self.run_name,
+            'started_at': self.started_at.isoformat(),
+            'total_wall_seconds': round(sum(s.wall_seconds for s in self.stages), 6),
+            'process_peak_rss_bytes': _peak_rss_bytes(),
+            'stages': [s.to_dict() for s in self.stages]
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """
+        Render the run in the Prometheus text exposition format
+        """
+        metrics = [
+            ('stage_wall_seconds', 'wall_seconds', 'gauge', 'Wall time spent in the stage'),
+            ('stage_network_seconds', 'network_seconds', 'gauge', 'Time spent waiting on HTTP requests'),
+            ('stage_sleep_seconds', 'sleep_seconds', 'gauge', 'Time spent in courtesy sleeps'),
+            ('stage_parse_seconds', 'parse_seconds', 'gauge', 'Time spent decoding JSON responses'),
+            ('stage_requests_total', 'requests', 'counter', 'HTTP requests issued'),
+            ('stage_bytes_received_total', 'bytes_received', 'counter', 'Response bytes received'),
+            ('stage_rows', 'rows', 'gauge', 'Rows processed by the stage'),
+            ('stage_peak_memory_bytes', 'peak_memory_bytes', 'gauge', 'Peak traced memory during the stage')
+        ]
+        lines = []
+        peak_rss = _peak_rss_bytes()
+        if peak_rss is not None:
+            name = "reddit_pipeline_process_peak_rss_bytes"
+            lines.append(f"# HELP {name} Peak resident set size of the process over the whole run")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f'{name}{{run="{self.run_name}"}} {peak_rss}')
+        for metric, field, metric_type, help_text in metrics:
+            name = f"reddit_pipeline_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for record in self.stages:
+                value = record.to_dict()[field]
+                if value is None:
+                    continue
+                lines.append(f'{name}{{run="{self.run_name}",stage="{record.name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def save(self, prefix=None):
+        """
+        Write the run metrics as <prefix>.json and <prefix>.prom
+        """
+        if prefix is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            prefix = os.path.join(self.output_dir, f"{self.run_name}_metrics_{self.started_at:%Y%m%d_%H%M%S}")
+        with open(f"{prefix}.json", 'w') as f:
+            f.write(self.to_json())
+        with open(f"{prefix}.prom", 'w') as f:
+            f.write(self.to_prometheus())
+        return f"{prefix}.json", f"{prefix}.prom"
+
+    def print_summary(self):
+        print(f"\n⏱️  STAGE TIMINGS ({self.run_name}):")
+        for record in self.stages:
+            print(f"   {record.name:<22} {record.wall_seconds:8.2f}s "
+                  f"(network {record.network_seconds:.2f}s, sleep {record.sleep_seconds:.2f}s, "
+                  f"parse {record.parse_seconds:.2f}s) - {record.requests} requests, "
+                  f"{record.bytes_received / 1024:.0f} KiB, {record.rows} rows"
+                  + (f", peak {record.peak_memory_bytes / 2**20:.1f} MiB" if record.peak_memory_bytes is not None else ""))
+        peak_rss = _peak_rss_bytes()
+        if peak_rss is not None:
+            print(f"   Process peak RSS: {peak_rss / 2**20:.1f} MiB")
@@ -0,0 +1,190 @@
+import argparse
+import importlib
+import sys
+
+# Only argparse is imported up front - each subcommand imports what it needs
+# (pandas, requests, ...) when it runs, so --help and cron reruns start fast.
+# Check with: python -X importtime reddit_cli.py --help
+
+DEFAULT_SUBREDDIT = 'sysadmin'
+DEFAULT_BASE_URL = 'https://www.reddit.com'
+
+
+def _csv_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _configure_capture(args):
+    if args.record or args.replay:
+        import reddit_http
+        if args.replay:
+            reddit_http.enable_replay(args.replay, as_of=args.as_of)
+        else:
+            reddit_http.enable_recording(args.record)
+
+
+def _check_endpoints(parser, args):
+    """
+    Reject --endpoints names the subcommand's collectors don't have
+    """
+    for module_name in args.collector_modules:
+        valid = importlib.import_module(module_name).ENDPOINT_NAMES
+        unknown = [name for name in args.endpoints if name not in valid]
+        if unknown:
+            parser.error(f"{args.command}: unknown --endpoints {', '.join(unknown)} "
+                         f"(choose from {', '.join(valid)})")
+
+
+def _collector_options(args, default_num_posts):
+    return {
+        'subreddit_name': args.subreddit,
+        'num_posts': args.num_posts or default_num_posts,
+        'endpoint_names': args.endpoints,
+        'base_url': args.base_url,
+        'user_agent': args.user_agent or None,
+        'request_delay': args.request_delay,
+        'auto_select_config': args.auto_config,
+        'profiler': args.profile,
+        'trace_memory': args.trace_memory,
+        'metrics_dir': args.metrics_dir
+    }
+
+
+def _author_filter_options(args):
+    return {'exclude_bots': args.exclude_bots, 'max_author_posts': args.max_author_posts}
+
+
+def _time_analysis_options(args):
+    import reddit_time_analysis
+    options = _collector_options(args, reddit_time_analysis.NUM_POSTS_TO_COLLECT)
+    options['user_agent'] = options['user_agent'] or reddit_time_analysis.USER_AGENT
+    if options['request_delay'] is None:
+        options['request_delay'] = 2
+    return reddit_time_analysis, options
+
+
+def _classification_options(args):
+    import reddit_questions
+    options = _collector_options(args, reddit_questions.NUM_POSTS_TO_ANALYZE)
+    options['user_agent'] = options['user_agent'] or reddit_questions.USER_AGENT
+    if options['request_delay'] is None:
+        options['request_delay'] = 1
+    return reddit_questions, options
+
+
+def cmd_collect(args):
+    module, options = _time_analysis_options(args)
+    df = module.main(analyze=False, **options)
+    return 0 if not df.empty else 1
+
+
+def cmd_analyze_times(args):
+    module, options = _time_analysis_options(args)
+    df = module.main(input_file=args.input, **options, **_author_filter_options(args))
+    return 0 if not df.empty else 1
+
+
+def cmd_classify(args):
+    module, options = _classification_options(args)
+    df = module.main(**options, **_author_filter_options(args))
+    return 0 if not df.empty else 1
+
+
+def cmd_report(args):
+    status = cmd_analyze_times(args)
+    # The time analysis --input CSV has no post bodies, so classification always collects
+    args.input = None
+    return max(status, cmd_classify(args))
+
+
+def cmd_serve(args):
+    import reddit_query_api
+    reddit_query_api.main(args.data_dir, args.host, args.port)
+    return 0
+
+
+def cmd_probe(args):
+    import endpoint_prober
+    _, best = endpoint_prober.run_probe_report(hosts=args.hosts, user_agents=args.user_agents,
+                                               attempts=args.attempts)
+    return 0 if best else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='reddit-analyzer',
+                                     description="Reddit posting-time and topic analysis")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    collector = argparse.ArgumentParser(add_help=False)
+    collector.add_argument('-s', '--subreddit', default=DEFAULT_SUBREDDIT)
+    collector.add_argument('-n', '--num-posts', type=int, help="posts to request across all endpoints")
+    collector.add_argument('--endpoints', type=_csv_list,
+                           help="comma-separated listing endpoints (hot,new,top_week; analyze-times also top_month)")
+    collector.add_argument('--base-url', default=DEFAULT_BASE_URL)
+    collector.add_argument('--user-agent', help="User-Agent header (defaults to the collector's own)")
+    collector.add_argument('--request-delay', type=float, help="seconds to sleep between requests")
+    collector.add_argument('--auto-config', action='store_true',
+                           help="probe for the fastest host/User-Agent at startup (not while recording/replaying)")
+    collector.add_argument('--profile', choices=['cprofile', 'pyinstrument'], help="profile every stage")
+    collector.add_argument('--trace-memory', action='store_true',
+                           help="record per-stage peak memory with tracemalloc (slower)")
+    collector.add_argument('--metrics-dir', help="write run metrics (.json and Prometheus .prom) to this directory")
+    capture = collector.add_mutually_exclusive_group()
+    capture.add_argument('--record', metavar='LOG', help="append every response to a capture log")
+    capture.add_argument('--replay', metavar='LOG', help="serve responses from a capture log, no network")
+    collector.add_argument('--as-of', type=float, help="with --replay, use captures taken at or before this epoch time")
+
+    author_filters = argparse.ArgumentParser(add_help=False)
+    author_filters.add_argument('--exclude-bots', action='store_true',
+                                help="drop posts by AutoModerator and other bot accounts")
+    author_filters.add_argument('--max-author-posts', type=int,
+                                help="drop posts by authors with more than this many posts")
+
+    subparsers.add_parser('collect', parents=[collector],
+                          help="collect posts and save the raw data CSV").set_defaults(
+        func=cmd_collect, collector_modules=('reddit_time_analysis',))
+
+    analyze = subparsers.add_parser('analyze-times', parents=[collector, author_filters],
+                                    help="best hours/days to post")
+    analyze.add_argument('-i', '--input', help="analyze a saved raw data CSV instead of collecting")
+    analyze.set_defaults(func=cmd_analyze_times, collector_modules=('reddit_time_analysis',))
+
+    subparsers.add_parser('classify', parents=[collector, author_filters],
+                          help="classify posts into topic categories").set_defaults(
+        func=cmd_classify, collector_modules=('reddit_questions',))
+
+    report = subparsers.add_parser('report', parents=[collector, author_filters],
+                                   help="run the time analysis and the classification")
+    report.add_argument('-i', '--input', help="time-analysis raw data CSV to reuse")
+    report.set_defaults(func=cmd_report, collector_modules=('reddit_time_analysis', 'reddit_questions'))
+
+    serve = subparsers.add_parser('serve', help="serve collected results over HTTP/JSON")
+    serve.add_argument('--data-dir', default='.')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.set_defaults(func=cmd_serve)
+
+    probe = subparsers.add_parser('probe', help="probe hosts and User-Agents for a working configuration")
+    probe.add_argument('--hosts', type=_csv_list)
+    probe.add_argument('--user-agents', type=_csv_list)
+    probe.add_argument('--attempts', type=int, default=3)
+    probe.set_defaults(func=cmd_probe)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'as_of', None) is not None and not args.replay:
+        parser.error("--as-of requires --replay")
+    if getattr(args, 'endpoints', None):
+        # Imported only when --endpoints is given, so plain runs and --help stay fast
+        _check_endpoints(parser, args)
+    # Configure capture once per invocation - `report` runs two collectors
+    if hasattr(args, 'record'):
+        _configure_capture(args)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+import bisect
+import json
+import os
+import threading
+import time
+import zlib
+
+# Record/replay - set REDDIT_CAPTURE_MODE=record|replay to capture or replay
+# every Reddit response without changing the analysis scripts
+CAPTURE_LOG_FILE = os.environ.get('REDDIT_CAPTURE_LOG', 'reddit_captures.log')
+CAPTURE_MODES = ('record', 'replay')
+
+_capture_log = None
+_capture_mode = None
+_replay_as_of = None
+
+# Reuse keep-alive connections across the collectors' sequential requests
+_session = None
+
+
+class ReplayMissError(LookupError):
+    """
+    Raised in replay mode when the capture log has no response for a URL
+    """
+
+
+class CaptureLog:
+    """
+    Compressed, append-only log of HTTP responses with an in-memory URL index
+
+    Bodies are zlib-compressed records in ``path``; every record gets one JSON
+    line in ``path + '.idx'`` with its URL, capture time, status and byte
+    range, so replay seeks straight to a record without decompressing others.
+    """
+
+    def __init__(self, path=CAPTURE_LOG_FILE):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self._lock = threading.Lock()
+        self._index = {}
+        self._writer = None
+        self._reader = None
+        self._index_file = None
+        self._index_needs_newline = False
+
+        if os.path.exists(self.index_path):
+            self._load_index()
+
+    def _load_index(self):
+        """
+        Read the index, dropping a final line torn by a crash mid-write
+        """
+        offset = 0
+        with open(self.index_path, 'rb') as f:
+            for line in f:
+                complete = line.endswith(b"\n")
+                if line.strip():
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        if complete:
+                            raise
+                        # Torn last line - cut it off so the next append starts cleanly
+                        with open(self.index_path, 'r+b') as index_file:
+                            index_file.truncate(offset)
+                        print(f"⚠️  Dropped a partial index line at the end of {self.index_path}")
+                        return
+                    self._add_to_index(entry)
+                    self._index_needs_newline = not complete
+                offset += len(line)
+
+    def _add_to_index(self, entry):
+        entries = self._index.setdefault(entry['url'], [])
+        if entries and entries[-1]['ts'] > entry['ts']:
+            bisect.insort(entries, entry, key=lambda e: e['ts'])
+        else:
+            entries.append(entry)
+
+    def append(self, url, status_code, content, timestamp=None):
+        """
+        Add a response to the end of the log
+        """
+        compressed = zlib.compress(content)
+        with self._lock:
+            if self._writer is None:
+                self._writer = open(self.path, 'ab')
+                self._index_file = open(self.index_path, 'a')
+                if self._index_needs_newline:
+                    self._index_file.write("\n")
+                    self._index_needs_newline = False
+            self._writer.seek(0, os.SEEK_END)
+            entry = {'url': url,
+                     'ts': timestamp if timestamp is not None else time.time(),
+                     'status': status_code,
+                     'offset': self._writer.tell(),
+                     'length': len(compressed)}
+            self._writer.write(compressed)
+            self._writer.flush()
+            # The index line goes last so a crash never indexes a partial record;
+            # a torn index line is dropped on the next load
+            self._index_file.write(json.dumps(entry) + "\n")
+            self._index_file.flush()
+            self._add_to_index(entry)
+        return entry
+
+    def lookup(self, url, as_of=None):
+        """
+        Index entry for the newest capture of ``url`` taken at or before ``as_of``
+        """
+        entries = self._index.get(url)
+        if not entries:
+            return None
+        if as_of is None:
+            return entries[-1]
+        position = bisect.bisect_right(entries, as_of, key=lambda e: e['ts'])
+        return entries[position - 1] if position else None
+
+    def read(self, entry):
+        """
+        Decompress the body stored for an index entry
+        """
+        with self._lock:
+            if self._reader is None:
+                self._reader = open(self.path, 'rb')
+            self._reader.seek(entry['offset'])
+            return zlib.decompress(self._reader.read(entry['length']))
+
+    def timestamps(self, url):
+        return [entry['ts'] for entry in self._index.get(url, [])]
+
+    def urls(self):
+        return list(self._index)
+
+    def latest_timestamp(self):
+        return max((entries[-1]['ts'] for entries in self._index.values()), default=None)
+
+    def close(self):
+        with self._lock:
+            for f in (self._writer, self._reader, self._index_file):
+                if f is not None:
+                    f.close()
+            self._writer = self._reader = self._index_file = None
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._index.values())
+
+
+class ReplayResponse:
+    """
+    Minimal stand-in for requests.Response served from the capture log
+    """
+
+    def __init__(self, url, status_code, content):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def enable_recording(path=CAPTURE_LOG_FILE):
+    """
+    Append every live response to the capture log at ``path``
+    """
+    global _capture_log, _capture_mode
+    disable_capture()
+    _capture_log, _capture_mode = CaptureLog(path), 'record'
+    return _capture_log
+
+
+def enable_replay(path=CAPTURE_LOG_FILE, as_of=None):
+    """
+    Serve every request from the capture log with zero network access
+
+    ``as_of`` (epoch seconds) replays the world as it was at that time.
+    """
+    global _capture_log, _capture_mode, _replay_as_of
+    disable_capture()
+    _capture_log, _capture_mode, _replay_as_of = CaptureLog(path), 'replay', as_of
+    print(f"📼 Replaying {len(_capture_log)} captured responses from {path}")
+    return _capture_log
+
+
+def disable_capture():
+    global _capture_log, _capture_mode, _replay_as_of
+    if _capture_log is not None:
+        _capture_log.close()
+    _capture_log = _capture_mode = _replay_as_of = None
+
+
+def replaying():
+    return _capture_mode == 'replay'
+
+
+def recording():
+    return _capture_mode == 'record'
+
+
+def reference_time():
+    """
+    Epoch time the analysis treats as "now"
+
+    When replaying this is the ``as_of`` time, or the newest capture in the
+    log, so post ages come out the same whichever day a capture is replayed.
+    """
+    if _capture_mode == 'replay':
+        if _replay_as_of is not None:
+            return _replay_as_of
+        latest = _capture_log.latest_timestamp()
+        if latest is not None:
+            return latest
+    return time.time()
+
+
+def _get_session():
+    """
+    Shared requests session, imported lazily so replay and cache-only runs skip requests
+    """
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+
+def reddit_get(url, headers, timeout=None, metrics=None):
+    """
+    GET a Reddit URL, reporting latency and bytes to the metrics collector
+    """
+    start = time.perf_counter()
+    if _capture_mode == 'replay':
+        entry = _capture_log.lookup(url, _replay_as_of)
+        if entry is None:
+            raise ReplayMissError(f"no capture for {url}")
+        response = ReplayResponse(url, entry['status'], _capture_log.read(entry))
+    else:
+        response = _get_session().get(url, headers=headers, timeout=timeout)
+        if _capture_mode == 'record':
+            _capture_log.append(url, response.status_code, response.content)
+    if metrics is not None:
+        metrics.record_request(len(response.content), time.perf_counter() - start)
+    return response
+
+
+def parse_json(response, metrics=None):
+    """
+    Decode a JSON response body, timing the decode separately from the network
+    """
+    start = time.perf_counter()
+    data = response.json()
+    if metrics is not None:
+        metrics.record_parse(time.perf_counter() - start)
+    return data
+
+
+def courtesy_sleep(seconds, metrics=None):
+    """
+    Pause between requests to be respectful to Reddit's servers
+    """
+    if _capture_mode == 'replay':
+        return  # nobody to be polite to
+    time.sleep(seconds)
+    if metrics is not None:
+        metrics.record_sleep(seconds)
+
+
+_env_mode = os.environ.get('REDDIT_CAPTURE_MODE')
+if _env_mode == 'record':
+    enable_recording()
+elif _env_mode == 'replay':
+    _env_as_of = os.environ.get('REDDIT_REPLAY_AS_OF')
+    enable_replay(as_of=float(_env_as_of) if _env_as_of else None)
+elif _env_mode:
+    raise ValueError(f"REDDIT_CAPTURE_MODE must be one of {', '.join(CAPTURE_MODES)}")
@@ -0,0 +1,386 @@
+import bisect
+import contextlib
+import glob
+import io
+import json
+import math
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from author_index import AuthorIndex
+from reddit_questions import analyze_category_distribution
+from reddit_time_analysis import analyze_posting_times
+
+# Configuration
+API_HOST = "127.0.0.1"
+API_PORT = 8080
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+RESULT_CACHE_SIZE = 1024
+
+POST_SORT_FIELDS = ('score', 'num_comments', 'engagement_score', 'normalized_engagement', 'created_utc')
+
+
+class LRUCache:
+    """
+    Small least-recently-used cache for serialized query results
+
+    Shared by every ThreadingHTTPServer worker thread, so all access is locked.
+    """
+
+    def __init__(self, max_size=RESULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# Result files are named <subreddit>_<kind>_<YYYYMMDD_HHMMSS>.csv by the analysis scripts
+POSTS_FILE_PATTERN = re.compile(r'(?P<subreddit>.+?)_(?:posting_)?analysis_(?P<timestamp>\d{8}_\d{6})\.csv')
+CLASSIFICATION_FILE_PATTERN = re.compile(r'(?P<subreddit>.+?)_post_classification_(?P<timestamp>\d{8}_\d{6})\.csv')
+
+
+def find_latest_files(pattern, data_dir='.'):
+    """
+    Return {subreddit: path} for the newest file per subreddit, by the timestamp in the name
+    """
+    latest = {}
+    for path in glob.glob(os.path.join(data_dir, '*.csv')):
+        match = pattern.fullmatch(os.path.basename(path))
+        if not match:
+            continue
+        subreddit, timestamp = match.group('subreddit').lower(), match.group('timestamp')
+        if subreddit not in latest or timestamp > latest[subreddit][0]:
+            latest[subreddit] = (timestamp, path)
+    return {subreddit: path for subreddit, (_, path) in sorted(latest.items())}
+
+
+def _read_csvs(paths):
+    frames = [pd.read_csv(path) for path in paths]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _post_id_from_permalink(permalink):
+    match = re.search(r'/comments/([a-z0-9]+)/', str(permalink))
+    return match.group(1) if match else None
+
+
+def _json_safe(value):
+    """
+    Convert numpy/pandas scalars into plain JSON-serializable values
+    """
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _frame_to_records(df):
+    return [{key: _json_safe(value) for key, value in row.items()}
+            for row in df.to_dict('records')]
+
+
+def load_collected_data(data_dir='.'):
+    """
+    Load the newest posting-analysis and classification CSVs from disk
+    """
+    posts_files = find_latest_files(POSTS_FILE_PATTERN, data_dir)
+    classification_files = find_latest_files(CLASSIFICATION_FILE_PATTERN, data_dir)
+
+    posts_df = _read_csvs(posts_files.values())
+    classified_df = _read_csvs(classification_files.values())
+
+    # Join the primary category onto the post store via the post id in the permalink
+    if not posts_df.empty and not classified_df.empty:
+        classified_df['id'] = classified_df['permalink'].map(_post_id_from_permalink)
+        categories = classified_df.dropna(subset=['id']).drop_duplicates(subset=['id'])
+        posts_df = posts_df.merge(categories[['id', 'primary_category']], on='id', how='left')
+
+    print(f"📂 Loaded {len(posts_df)} posts from {', '.join(posts_files.values()) or 'nothing'}")
+    print(f"📂 Loaded {len(classified_df)} classified posts from "
+          f"{', '.join(classification_files.values()) or 'nothing'}")
+
+    return posts_df, classified_df
+
+
+class PostStore:
+    """
+    In-memory post store with precomputed aggregates and lookup indexes
+    """
+
+    def __init__(self, posts_df, classified_df=None, cache_size=RESULT_CACHE_SIZE):
+        self.cache = LRUCache(cache_size)
+        self.load(posts_df, classified_df if classified_df is not None else pd.DataFrame())
+
+    def load(self, posts_df, classified_df):
+        """
+        Build indexes and aggregates once so requests never touch pandas
+        """
+        self.records = _frame_to_records(posts_df) if not posts_df.empty else []
+        self.authors = AuthorIndex()
+        if not posts_df.empty:
+            self.authors.add_frame(posts_df)
+
+        self.by_subreddit = defaultdict(list)
+        self.by_category = defaultdict(list)
+        self.by_hour = defaultdict(list)
+        self.by_day = defaultdict(list)
+        for position, post in enumerate(self.records):
+            self.by_subreddit[str(post.get('subreddit', '')).lower()].append(position)
+            self.by_category[post.get('primary_category') or 'unclassified'].append(position)
+            if post.get('hour') is not None:
+                self.by_hour[int(post['hour'])].append(position)
+            if post.get('day_of_week') is not None:
+                self.by_day[int(post['day_of_week'])].append(position)
+
+        # Sorted (created_utc, position) pairs for range queries
+        self.by_time = sorted((post['created_utc'], position)
+                              for position, post in enumerate(self.records)
+                              if post.get('created_utc') is not None)
+        self._time_keys = [created for created, _ in self.by_time]
+
+        self.hourly = {}
+        self.daily = {}
+        if not posts_df.empty:
+            for subreddit, group in posts_df.groupby(posts_df['subreddit'].str.lower()):
+                # The analysis functions report to stdout; keep the server log quiet
+                with contextlib.redirect_stdout(io.StringIO()):
+                    hourly_stats, daily_stats = analyze_posting_times(group, subreddit)
+                self.hourly[subreddit] = _frame_to_records(hourly_stats.reset_index())
+                self.daily[subreddit] = _frame_to_records(daily_stats.reset_index())
+
+        self.categories = []
+        if not classified_df.empty:
+            with contextlib.redirect_stdout(io.StringIO()):
+                category_counts = analyze_category_distribution(classified_df, {})
+            total = int(category_counts.sum())
+            self.categories = [{'category': category,
+                                'post_count': int(count),
+                                'percentage': round(count / total * 100, 1)}
+                               for category, count in category_counts.items()]
+
+        self.cache.clear()
+
+    def _time_range(self, since, until):
+        start = 0 if since is None else bisect.bisect_left(self._time_keys, since)
+        end = len(self._time_keys) if until is None else bisect.bisect_right(self._time_keys, until)
+        return [position for _, position in self.by_time[start:end]]
+
+    def query_posts(self, subreddit=None, category=None, hour=None, day=None,
+                    since=None, until=None, sort='score', page=1, per_page=DEFAULT_PAGE_SIZE,
+                    exclude_bots=False, max_author_posts=None):
+        """
+        Return one page of posts matching every given filter
+        """
+        candidates = []
+        if subreddit is not None:
+            candidates.append(self.by_subreddit.get(subreddit.lower(), []))
+        if category is not None:
+            candidates.append(self.by_category.get(category, []))
+        if hour is not None:
+            candidates.append(self.by_hour.get(hour, []))
+        if day is not None:
+            candidates.append(self.by_day.get(day, []))
+        if since is not None or until is not None:
+            candidates.append(self._time_range(since, until))
+
+        if candidates:
+            # Walk the smallest index and probe the rest as sets
+            candidates.sort(key=len)
+            others = [set(index) for index in candidates[1:]]
+            positions = [p for p in candidates[0] if all(p in other for other in others)]
+        else:
+            positions = range(len(self.records))
+
+        if exclude_bots or max_author_posts is not None:
+            excluded = self.authors.excluded_authors(exclude_bots, max_author_posts)
+            positions = [p for p in positions if self.records[p].get('author') not in excluded]
+
+        matches = sorted(positions, key=lambda p: self.records[p].get(sort) or 0, reverse=True)
+        start = (page - 1) * per_page
+        return {
+            'total': len(matches),
+            'page': page,
+            'per_page': per_page,
+            'pages': math.ceil(len(matches) / per_page) if matches else 0,
+            'results': [self.records[p] for p in matches[start:start + per_page]]
+        }
+
+    def cached(self, key, compute):
+        """
+        Serve serialized JSON from the LRU cache, computing it on a miss
+        """
+        body = self.cache.get(key)
+        if body is None:
+            body = json.dumps(compute(), default=str).encode('utf-8')
+            self.cache.put(key, body)
+        return body
+
+
+def _int_param(params, name, default=None, minimum=None, maximum=None):
+    if name not in params:
+        return default
+    value = int(params[name][0])
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}")
+    if maximum is not None:
+        value = min(value, maximum)
+    return value
+
+
+def _float_param(params, name):
+    return float(params[name][0]) if name in params else None
+
+
+def _str_param(params, name, default=None):
+    return params[name][0] if name in params else default
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    JSON request handler for the post store
+    """
+    protocol_version = 'HTTP/1.1'  # keep-alive for dashboards polling the API
+    store = None
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        route = parsed.path.rstrip('/') or '/'
+
+        try:
+            if route == '/health':
+                body = json.dumps({'status': 'ok',
+                                   'posts': len(self.store.records),
+                                   'cache_entries': len(self.store.cache),
+                                   'cache_hits': self.store.cache.hits,
+                                   'cache_misses': self.store.cache.misses}).encode('utf-8')
+            elif route == '/posts':
+                sort = _str_param(params, 'sort', 'score')
+                if sort not in POST_SORT_FIELDS:
+                    raise ValueError(f"sort must be one of {', '.join(POST_SORT_FIELDS)}")
+                query = {
+                    'subreddit': _str_param(params, 'subreddit'),
+                    'category': _str_param(params, 'category'),
+                    'hour': _int_param(params, 'hour'),
+                    'day': _int_param(params, 'day'),
+                    'since': _float_param(params, 'since'),
+                    'until': _float_param(params, 'until'),
+                    'sort': sort,
+                    'page': _int_param(params, 'page', 1, minimum=1),
+                    'per_page': _int_param(params, 'per_page', DEFAULT_PAGE_SIZE, minimum=1, maximum=MAX_PAGE_SIZE),
+                    'exclude_bots': _str_param(params, 'exclude_bots', '0').lower() in ('1', 'true', 'yes'),
+                    'max_author_posts': _int_param(params, 'max_author_posts', minimum=1)
+                }
+                key = ('posts',) + tuple(sorted(query.items()))
+                body = self.store.cached(key, lambda: self.store.query_posts(**query))
+            elif route in ('/aggregates/hourly', '/aggregates/daily'):
+                table = self.store.hourly if route.endswith('hourly') else self.store.daily
+                subreddit = _str_param(params, 'subreddit')
+                key = (route, subreddit)
+                if subreddit is None:
+                    body = self.store.cached(key, lambda: table)
+                elif subreddit.lower() in table:
+                    body = self.store.cached(key, lambda: table[subreddit.lower()])
+                else:
+                    self._send_json(404, {'error': f"no data for r/{subreddit}"})
+                    return
+            elif route == '/aggregates/categories':
+                body = self.store.cached((route,), lambda: self.store.categories)
+            else:
+                self._send_json(404, {'error': f"unknown endpoint {route}"})
+                return
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        self._send_body(200, body)
+
+    def _send_json(self, status, payload):
+        self._send_body(status, json.dumps(payload).encode('utf-8'))
+
+    def _send_body(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request logging costs more than the lookups themselves
+        pass
+
+
+def create_server(store, host=API_HOST, port=API_PORT):
+    """
+    Create (but do not start) an HTTP server bound to the given store
+    """
+    handler = type('BoundQueryHandler', (QueryHandler,), {'store': store})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(data_dir='.', host=API_HOST, port=API_PORT):
+    """
+    Load the newest collected data and serve it over HTTP/JSON
+    """
+    print(f"🚀 Starting Reddit query API")
+    print("="*70)
+
+    posts_df, classified_df = load_collected_data(data_dir)
+    if posts_df.empty and classified_df.empty:
+        print("❌ No collected data found - run the analysis scripts first")
+        return
+
+    store = PostStore(posts_df, classified_df)
+    server = create_server(store, host, port)
+
+    print(f"📡 Serving on http://{host}:{port}")
+    print(f"   GET /posts?subreddit=&category=&hour=&day=&since=&until=&sort=&page=&per_page=")
+    print(f"             &exclude_bots=&max_author_posts=")
+    print(f"   GET /aggregates/hourly?subreddit=")
+    print(f"   GET /aggregates/daily?subreddit=")
+    print(f"   GET /aggregates/categories")
+    print(f"   GET /health")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else '.')
@@ -1,22 +1,104 @@
-import requests
 import pandas as pd
-import re
 import datetime
-import time
-from collections import Counter
+
+from author_index import AuthorIndex
+from endpoint_prober import select_collector_config
+from pipeline_metrics import PipelineMetrics
+from reddit_http import courtesy_sleep, parse_json, reddit_get, reference_time
 
 # Configuration
 SUBREDDIT_TO_ANALYZE = "sysadmin"
 NUM_POSTS_TO_ANALYZE = 100  # Analyze more posts for better category distribution
+REDDIT_BASE_URL = "https://www.reddit.com"
+USER_AGENT = 'python:RedditPostClassifier:v1.0.0 (by /u/External_Necessary48)'
+AUTO_SELECT_CONFIG = False  # opt-in: probe hosts/User-Agents at startup and use the fastest working one
+
+# Author filtering - drop bot accounts and/or authors with more than MAX_POSTS_PER_AUTHOR posts
+EXCLUDE_BOTS = False
+MAX_POSTS_PER_AUTHOR = None
+
+# Instrumentation - set PROFILER to 'cprofile' or 'pyinstrument' to profile each stage
+PROFILER = None
+TRACE_MEMORY = False  # per-stage peak memory via tracemalloc (slower)
+METRICS_DIR = None  # directory for the run metrics .json/.prom export (None: don't write them)
+
+# Enhanced category definitions with more keywords
+POST_CATEGORIES = {
+    'backup_recovery': {
+        'keywords': ['backup', 'restore', 'recovery', 'disaster recovery', 'failover', 'redundancy', 
+                    'snapshot', 'replication', 'backup solution', 'data protection', 'business continuity'],
+        'description': 'Backup and disaster recovery solutions'
+    },
+    'security': {
+        'keywords': ['security', 'vulnerability', 'breach', 'password', 'authentication', 'encryption', 
+                    'firewall', 'antivirus', 'malware', 'phishing', 'ssl', 'certificate', 'audit', 
+                    'compliance', 'threat', 'intrusion'],
+        'description': 'Security and compliance topics'
+    },
+    'monitoring_alerting': {
+        'keywords': ['monitoring', 'alert', 'dashboard', 'metrics', 'logging', 'performance', 
+                    'nagios', 'zabbix', 'prtg', 'scom', 'grafana', 'prometheus', 'uptime'],
+        'description': 'System monitoring and alerting'
+    },
+    'automation_scripting': {
+        'keywords': ['automation', 'script', 'powershell', 'bash', 'python', 'ansible', 'puppet', 
+                    'chef', 'terraform', 'devops', 'ci/cd', 'jenkins', 'automated'],
+        'description': 'Automation and scripting solutions'
+    },
+    'infrastructure': {
+        'keywords': ['server', 'network', 'router', 'switch', 'dns', 'dhcp', 'hardware', 'datacenter', 
+                    'rack', 'cables', 'switches', 'infrastructure', 'topology'],
+        'description': 'Network and server infrastructure'
+    },
+    'cloud_services': {
+        'keywords': ['cloud', 'aws', 'azure', 'google cloud', 'saas', 'iaas', 'paas', 'office 365', 
+                    'migration', 'hybrid cloud', 'multi-cloud'],
+        'description': 'Cloud platforms and services'
+    },
+    'software_management': {
+        'keywords': ['software', 'application', 'deployment', 'update', 'patch', 'install', 
+                    'package', 'licensing', 'wsus', 'sccm', 'software center'],
+        'description': 'Software deployment and management'
+    },
+    'documentation': {
+        'keywords': ['documentation', 'document', 'wiki', 'knowledge base', 'procedures', 'runbook', 
+                    'confluence', 'sharepoint', 'process', 'standard operating procedure'],
+        'description': 'Documentation and knowledge management'
+    },
+    'team_management': {
+        'keywords': ['team', 'staff', 'management', 'leadership', 'hiring', 'training', 'employee', 
+                    'onboarding', 'meeting', 'budget', 'vendor management'],
+        'description': 'Team and project management'
+    },
+    'career_advice': {
+        'keywords': ['career', 'job', 'salary', 'promotion', 'certification', 'skills', 'resume', 
+                    'interview', 'ccna', 'mcsa', 'comptia', 'training'],
+        'description': 'Career development and advice'
+    },
+    'troubleshooting': {
+        'keywords': ['troubleshooting', 'problem', 'issue', 'error', 'fix', 'broken', 'not working', 
+                    'help', 'debug', 'diagnose'],
+        'description': 'Technical troubleshooting and problems'
+    },
+    'virtualization': {
+        'keywords': ['vmware', 'hyper-v', 'virtualbox', 'vm', 'virtual machine', 'vcenter', 
+                    'esxi', 'virtualization', 'container', 'docker'],
+        'description': 'Virtualization technologies'
+    }
+}
+
+ENDPOINT_NAMES = ('hot', 'new', 'top_week')
 
-def collect_posts_for_classification(subreddit_name, num_posts=100):
+def collect_posts_for_classification(subreddit_name, num_posts=100, metrics=None,
+                                     base_url=REDDIT_BASE_URL, user_agent=USER_AGENT, request_delay=1,
+                                     endpoint_names=None, author_index=None):
     """
     Collect recent posts with their content for classification
     """
     print(f"🔍 Collecting posts from r/{subreddit_name} for classification...")
     
     headers = {
-        'User-Agent': 'python:RedditPostClassifier:v1.0.0 (by /u/External_Necessary48)'
+        'User-Agent': user_agent
     }
     
     all_posts = []
@@ -25,29 +107,34 @@ def collect_posts_for_classification(subreddit_name, num_posts=100):
     endpoints = [
         {
             'name': 'hot',
-            'url': f'https://www.reddit.com/r/{subreddit_name}/hot.json?limit={num_posts//3}',
+            'url': f'{base_url}/r/{subreddit_name}/hot.json?limit={num_posts//3}',
             'description': 'Currently popular posts'
         },
         {
             'name': 'new',
-            'url': f'https://www.reddit.com/r/{subreddit_name}/new.json?limit={num_posts//3}',
+            'url': f'{base_url}/r/{subreddit_name}/new.json?limit={num_posts//3}',
             'description': 'Recent posts'
         },
         {
             'name': 'top_week',
-            'url': f'https://www.reddit.com/r/{subreddit_name}/top.json?t=week&limit={num_posts//3}',
+            'url': f'{base_url}/r/{subreddit_name}/top.json?t=week&limit={num_posts//3}',
             'description': 'Top posts this week'
         }
     ]
+    if endpoint_names:
+        endpoints = [e for e in endpoints if e['name'] in endpoint_names]
+    
+    # Replays measure post age from the capture time, not the wall clock
+    now = datetime.datetime.fromtimestamp(reference_time())
     
     for endpoint in endpoints:
         print(f"  📥 Getting {endpoint['name']} posts...")
         
         try:
-            response = requests.get(endpoint['url'], headers=headers)
+            response = reddit_get(endpoint['url'], headers, metrics=metrics)
             
             if response.status_code == 200:
-                posts_data = response.json()['data']['children']
+                posts_data = parse_json(response, metrics)['data']['children']
                 print(f"    ✅ Retrieved {len(posts_data)} posts")
                 
                 for post in posts_data:
@@ -68,7 +155,7 @@ def collect_posts_for_classification(subreddit_name, num_posts=100):
                         'upvote_ratio': post_data.get('upvote_ratio', 0),
                         'num_comments': post_data['num_comments'],
                         'created_time': post_time,
-                        'days_ago': (datetime.datetime.now() - post_time).days,
+                        'days_ago': (now - post_time).days,
                         'author': post_data.get('author', '[deleted]'),
                         'is_self_post': post_data.get('is_self', False),
                         'url': post_data.get('url', ''),
@@ -76,6 +163,11 @@ def collect_posts_for_classification(subreddit_name, num_posts=100):
                         'flair': post_data.get('link_flair_text', ''),
                         'post_type': endpoint['name']
                     })
+                    
+                    if author_index is not None:
+                        author_index.add(post_data.get('author', '[deleted]'), post_data['created_utc'],
+                                         post_data['score'], post_data['num_comments'],
+                                         post_data.get('stickied', False), post_data['id'])
                 
             else:
                 print(f"    ❌ Failed with status {response.status_code}")
@@ -83,7 +175,7 @@ def collect_posts_for_classification(subreddit_name, num_posts=100):
         except Exception as e:
             print(f"    ❌ Error: {e}")
         
-        time.sleep(1)  # Rate limiting
+        courtesy_sleep(request_delay, metrics)  # Rate limiting
     
     # Remove duplicates and convert to DataFrame
     df = pd.DataFrame(all_posts)
@@ -102,71 +194,8 @@ def classify_posts(posts_df):
     if posts_df.empty:
         return posts_df
     
-    # Enhanced category definitions with more keywords
-    categories = {
-        'backup_recovery': {
-            'keywords': ['backup', 'restore', 'recovery', 'disaster recovery', 'failover', 'redundancy', 
-                        'snapshot', 'replication', 'backup solution', 'data protection', 'business continuity'],
-            'description': 'Backup and disaster recovery solutions'
-        },
-        'security': {
-            'keywords': ['security', 'vulnerability', 'breach', 'password', 'authentication', 'encryption', 
-                        'firewall', 'antivirus', 'malware', 'phishing', 'ssl', 'certificate', 'audit', 
-                        'compliance', 'threat', 'intrusion'],
-            'description': 'Security and compliance topics'
-        },
-        'monitoring_alerting': {
-            'keywords': ['monitoring', 'alert', 'dashboard', 'metrics', 'logging', 'performance', 
-                        'nagios', 'zabbix', 'prtg', 'scom', 'grafana', 'prometheus', 'uptime'],
-            'description': 'System monitoring and alerting'
-        },
-        'automation_scripting': {
-            'keywords': ['automation', 'script', 'powershell', 'bash', 'python', 'ansible', 'puppet', 
-                        'chef', 'terraform', 'devops', 'ci/cd', 'jenkins', 'automated'],
-            'description': 'Automation and scripting solutions'
-        },
-        'infrastructure': {
-            'keywords': ['server', 'network', 'router', 'switch', 'dns', 'dhcp', 'hardware', 'datacenter', 
-                        'rack', 'cables', 'switches', 'infrastructure', 'topology'],
-            'description': 'Network and server infrastructure'
-        },
-        'cloud_services': {
-            'keywords': ['cloud', 'aws', 'azure', 'google cloud', 'saas', 'iaas', 'paas', 'office 365', 
-                        'migration', 'hybrid cloud', 'multi-cloud'],
-            'description': 'Cloud platforms and services'
-        },
-        'software_management': {
-            'keywords': ['software', 'application', 'deployment', 'update', 'patch', 'install', 
-                        'package', 'licensing', 'wsus', 'sccm', 'software center'],
-            'description': 'Software deployment and management'
-        },
-        'documentation': {
-            'keywords': ['documentation', 'document', 'wiki', 'knowledge base', 'procedures', 'runbook', 
-                        'confluence', 'sharepoint', 'process', 'standard operating procedure'],
-            'description': 'Documentation and knowledge management'
-        },
-        'team_management': {
-            'keywords': ['team', 'staff', 'management', 'leadership', 'hiring', 'training', 'employee', 
-                        'onboarding', 'meeting', 'budget', 'vendor management'],
-            'description': 'Team and project management'
-        },
-        'career_advice': {
-            'keywords': ['career', 'job', 'salary', 'promotion', 'certification', 'skills', 'resume', 
-                        'interview', 'ccna', 'mcsa', 'comptia', 'training'],
-            'description': 'Career development and advice'
-        },
-        'troubleshooting': {
-            'keywords': ['troubleshooting', 'problem', 'issue', 'error', 'fix', 'broken', 'not working', 
-                        'help', 'debug', 'diagnose'],
-            'description': 'Technical troubleshooting and problems'
-        },
-        'virtualization': {
-            'keywords': ['vmware', 'hyper-v', 'virtualbox', 'vm', 'virtual machine', 'vcenter', 
-                        'esxi', 'virtualization', 'container', 'docker'],
-            'description': 'Virtualization technologies'
-        }
-    }
-    
+    categories = POST_CATEGORIES
+
     classified_posts = []
     
     for idx, row in posts_df.iterrows():
@@ -304,31 +333,69 @@ def save_classification_results(classified_df, subreddit_name):
     print(f"\n💾 Classification results saved to: {filename}")
     return filename
 
-def main():
+def main(subreddit_name=SUBREDDIT_TO_ANALYZE, num_posts=NUM_POSTS_TO_ANALYZE, endpoint_names=None,
+         base_url=REDDIT_BASE_URL, user_agent=USER_AGENT, request_delay=1,
+         auto_select_config=AUTO_SELECT_CONFIG, profiler=PROFILER, trace_memory=TRACE_MEMORY,
+         metrics_dir=METRICS_DIR,
+         exclude_bots=EXCLUDE_BOTS, max_author_posts=MAX_POSTS_PER_AUTHOR):
     """
     Main function to run post classification analysis
     """
-    print(f"🚀 Post Classification Analysis for r/{SUBREDDIT_TO_ANALYZE}")
+    print(f"🚀 Post Classification Analysis for r/{subreddit_name}")
     print("="*70)
     
+    metrics = PipelineMetrics(f"{subreddit_name}_classification", profiler=profiler, trace_memory=trace_memory,
+                              output_dir=metrics_dir or '.')
+    author_index = AuthorIndex()
+    
+    # Pick the fastest working host/User-Agent
+    config = {'base_url': base_url, 'user_agent': user_agent}
+    if auto_select_config:
+        with metrics.stage('probe'):
+            config = select_collector_config(subreddit_name, base_url, user_agent)
+    
     # Collect posts
-    posts_df = collect_posts_for_classification(SUBREDDIT_TO_ANALYZE, NUM_POSTS_TO_ANALYZE)
+    with metrics.stage('collect') as stage:
+        posts_df = collect_posts_for_classification(subreddit_name, num_posts, metrics=metrics,
+                                                    request_delay=request_delay,
+                                                    endpoint_names=endpoint_names,
+                                                    author_index=author_index, **config)
+        stage.rows = len(posts_df)
     
     if posts_df.empty:
         print("❌ No posts collected")
-        return
+        return posts_df
+    
+    # Drop bots / prolific authors with O(1) lookups in the per-author index
+    posts_df = author_index.filter_frame(posts_df, exclude_bots, max_author_posts)
+    if posts_df.empty:
+        print("❌ No posts left after excluding bot/prolific authors")
+        return posts_df
     
     # Classify posts
-    classified_df, categories = classify_posts(posts_df)
+    with metrics.stage('classify') as stage:
+        classified_df, categories = classify_posts(posts_df)
+        stage.rows = len(classified_df)
     
     # Analyze distribution
-    category_counts = analyze_category_distribution(classified_df, categories)
+    with metrics.stage('category_distribution') as stage:
+        category_counts = analyze_category_distribution(classified_df, categories)
+        stage.rows = len(classified_df)
     
     # Analyze trending topics
-    analyze_trending_topics(classified_df)
+    with metrics.stage('trending_topics') as stage:
+        analyze_trending_topics(classified_df)
+        stage.rows = len(classified_df)
     
     # Save results
-    save_classification_results(classified_df, SUBREDDIT_TO_ANALYZE)
+    with metrics.stage('save') as stage:
+        save_classification_results(classified_df, subreddit_name)
+        stage.rows = len(classified_df)
+    
+    metrics.print_summary()
+    if metrics_dir is not None:
+        json_file, prom_file = metrics.save()
+        print(f"💾 Run metrics saved to: {json_file}, {prom_file}")
     
     print(f"\n" + "="*70)
     print("✅ CLASSIFICATION ANALYSIS COMPLETE!")
@@ -336,6 +403,8 @@ def main():
     print(f"🏷️  Identified {len(category_counts)} active categories")
     print(f"📈 Found trending topics and engagement patterns")
     print(f"💾 Results exported for further analysis")
+    
+    return classified_df
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,14 +1,32 @@
-import requests
 import pandas as pd
 import datetime
-import time
-import json
-import os
+
+from author_index import AuthorIndex
+from endpoint_prober import select_collector_config
+from pipeline_metrics import PipelineMetrics
+from reddit_http import courtesy_sleep, parse_json, reddit_get, reference_time
 
 # Configuration - Change this to analyze different subreddits
 SUBREDDIT_TO_ANALYZE = "sysadmin"  # Change this to analyze different subreddits
+NUM_POSTS_TO_COLLECT = 600
+REDDIT_BASE_URL = "https://www.reddit.com"
+USER_AGENT = 'python:RedditAnalyzer:v1.0.0 (by /u/External_Necessary48)'
+AUTO_SELECT_CONFIG = False  # opt-in: probe hosts/User-Agents at startup and use the fastest working one
+
+# Author filtering - drop bot accounts and/or authors with more than MAX_POSTS_PER_AUTHOR posts
+EXCLUDE_BOTS = False
+MAX_POSTS_PER_AUTHOR = None
+
+# Instrumentation - set PROFILER to 'cprofile' or 'pyinstrument' to profile each stage
+PROFILER = None
+TRACE_MEMORY = False  # per-stage peak memory via tracemalloc (slower)
+METRICS_DIR = None  # directory for the run metrics .json/.prom export (None: don't write them)
 
-def collect_reddit_data_json(subreddit_name, num_posts=500):
+ENDPOINT_NAMES = ('hot', 'new', 'top_week', 'top_month')
+
+def collect_reddit_data_json(subreddit_name, num_posts=500, metrics=None,
+                             base_url=REDDIT_BASE_URL, user_agent=USER_AGENT, request_delay=2,
+                             endpoint_names=None, author_index=None):
     """
     Collect Reddit data using JSON API (bypasses PRAW issues)
     """
@@ -16,7 +34,7 @@ def collect_reddit_data_json(subreddit_name, num_posts=500):
     
     # Working User-Agent from our test
     headers = {
-        'User-Agent': 'python:RedditAnalyzer:v1.0.0 (by /u/External_Necessary48)'
+        'User-Agent': user_agent
     }
     
     posts_data = []
@@ -25,34 +43,36 @@ def collect_reddit_data_json(subreddit_name, num_posts=500):
     endpoints = [
         {
             'name': 'hot',
-            'url': f'https://www.reddit.com/r/{subreddit_name}/hot.json?limit={num_posts//4}',
+            'url': f'{base_url}/r/{subreddit_name}/hot.json?limit={num_posts//4}',
             'description': 'Currently popular posts'
         },
         {
             'name': 'new',
-            'url': f'https://www.reddit.com/r/{subreddit_name}/new.json?limit={num_posts//4}',
+            'url': f'{base_url}/r/{subreddit_name}/new.json?limit={num_posts//4}',
             'description': 'Recent posts'
         },
         {
             'name': 'top_week',
-            'url': f'https://www.reddit.com/r/{subreddit_name}/top.json?t=week&limit={num_posts//4}',
+            'url': f'{base_url}/r/{subreddit_name}/top.json?t=week&limit={num_posts//4}',
             'description': 'Top posts this week'
         },
         {
             'name': 'top_month',
-            'url': f'https://www.reddit.com/r/{subreddit_name}/top.json?t=month&limit={num_posts//4}',
+            'url': f'{base_url}/r/{subreddit_name}/top.json?t=month&limit={num_posts//4}',
             'description': 'Top posts this month'
         }
     ]
+    if endpoint_names:
+        endpoints = [e for e in endpoints if e['name'] in endpoint_names]
     
     for endpoint in endpoints:
         print(f"  📥 Collecting {endpoint['name']} posts ({endpoint['description']})...")
         
         try:
-            response = requests.get(endpoint['url'], headers=headers, timeout=15)
+            response = reddit_get(endpoint['url'], headers, timeout=15, metrics=metrics)
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response, metrics)
                 posts = data['data']['children']
                 
                 print(f"    ✅ Retrieved {len(posts)} posts")
@@ -88,6 +108,10 @@ def collect_reddit_data_json(subreddit_name, num_posts=500):
                         
                         posts_data.append(post_info)
                         
+                        if author_index is not None:
+                            author_index.add(post_info['author'], post_data['created_utc'], post_data['score'],
+                                             post_data['num_comments'], post_info['is_stickied'], post_info['id'])
+                        
                     except Exception as e:
                         print(f"    ⚠️  Error processing post: {e}")
                         continue
@@ -98,7 +122,7 @@ def collect_reddit_data_json(subreddit_name, num_posts=500):
                 print(f"    ❌ 404 Not Found - subreddit doesn't exist")
             elif response.status_code == 429:
                 print(f"    ⏰ Rate limited - waiting 10 seconds...")
-                time.sleep(10)
+                courtesy_sleep(10, metrics)
             else:
                 print(f"    ❌ HTTP {response.status_code}")
                 
@@ -106,7 +130,7 @@ def collect_reddit_data_json(subreddit_name, num_posts=500):
             print(f"    ❌ Request failed: {e}")
         
         # Be respectful to Reddit's servers
-        time.sleep(2)
+        courtesy_sleep(request_delay, metrics)
     
     # Convert to DataFrame and remove duplicates
     df = pd.DataFrame(posts_data)
@@ -140,7 +164,8 @@ def calculate_engagement_metrics(df):
     df['comments_per_score'] = df['num_comments'] / (df['score'] + 1)  # +1 to avoid division by zero
     
     # Age of post in days
-    now = datetime.datetime.now()
+    # Measured from the replay time when replaying captures, so reruns are reproducible
+    now = datetime.datetime.fromtimestamp(reference_time())
     df['days_old'] = (now - pd.to_datetime(df['created_datetime'])).dt.days
     
     # Normalized engagement (accounting for post age)
@@ -332,48 +357,115 @@ def save_results(df, hourly_stats, daily_stats, subreddit_name):
     if daily_stats is not None:
         print(f"   📁 Daily analysis: {daily_filename}")
 
-def main():
+def load_collected_data(filename):
+    """
+    Load a raw data CSV written by save_results (for cache-only reruns)
+    """
+    df = pd.read_csv(filename, parse_dates=['created_datetime'])
+    print(f"📂 Loaded {len(df)} posts from {filename}")
+    return df
+
+def main(subreddit_name=SUBREDDIT_TO_ANALYZE, num_posts=NUM_POSTS_TO_COLLECT, endpoint_names=None,
+         base_url=REDDIT_BASE_URL, user_agent=USER_AGENT, request_delay=2,
+         auto_select_config=AUTO_SELECT_CONFIG, profiler=PROFILER, trace_memory=TRACE_MEMORY,
+         metrics_dir=METRICS_DIR,
+         input_file=None, analyze=True,
+         exclude_bots=EXCLUDE_BOTS, max_author_posts=MAX_POSTS_PER_AUTHOR):
     """
     Main function to run the complete analysis
+
+    Pass input_file to rerun the analysis on a saved CSV without touching the
+    network, or analyze=False to only collect and save the raw data.
     """
-    print(f"🚀 Reddit Time Series Analysis for r/{SUBREDDIT_TO_ANALYZE}")
+    print(f"🚀 Reddit Time Series Analysis for r/{subreddit_name}")
     print(f"📡 Using Reddit JSON API (no authentication required)")
     print("="*70)
     
-    # Collect data
-    df = collect_reddit_data_json(SUBREDDIT_TO_ANALYZE, num_posts=600)
+    metrics = PipelineMetrics(f"{subreddit_name}_time_analysis", profiler=profiler, trace_memory=trace_memory,
+                              output_dir=metrics_dir or '.')
+    author_index = AuthorIndex()
+    
+    if input_file:
+        with metrics.stage('load') as stage:
+            df = load_collected_data(input_file)
+            author_index.add_frame(df)
+            stage.rows = len(df)
+    else:
+        # Pick the fastest working host/User-Agent
+        config = {'base_url': base_url, 'user_agent': user_agent}
+        if auto_select_config:
+            with metrics.stage('probe'):
+                config = select_collector_config(subreddit_name, base_url, user_agent)
+        
+        # Collect data
+        with metrics.stage('collect') as stage:
+            df = collect_reddit_data_json(subreddit_name, num_posts=num_posts, metrics=metrics,
+                                          request_delay=request_delay, endpoint_names=endpoint_names,
+                                          author_index=author_index, **config)
+            stage.rows = len(df)
     
     if df.empty:
-        print(f"❌ No data collected from r/{SUBREDDIT_TO_ANALYZE}")
+        print(f"❌ No data collected from r/{subreddit_name}")
         print("Possible reasons:")
         print("   - Subreddit is private or doesn't exist")
         print("   - Network connectivity issues")
         print("   - Reddit API temporarily unavailable")
-        return
+        return df
     
     # Calculate engagement metrics
-    df = calculate_engagement_metrics(df)
+    with metrics.stage('engagement_metrics') as stage:
+        df = calculate_engagement_metrics(df)
+        stage.rows = len(df)
+    
+    if not analyze:
+        with metrics.stage('save') as stage:
+            save_results(df, None, None, subreddit_name)
+            stage.rows = len(df)
+        metrics.print_summary()
+        if metrics_dir is not None:
+            metrics.save()
+        return df
+    
+    # Drop bots / prolific authors with O(1) lookups in the per-author index.
+    # Only the analysis uses the filtered posts - the raw data CSV keeps them all.
+    analysis_df = author_index.filter_frame(df, exclude_bots, max_author_posts)
+    if analysis_df.empty:
+        print("❌ No posts left after excluding bot/prolific authors")
+        return analysis_df
     
     # Perform analysis
-    hourly_stats, daily_stats = analyze_posting_times(df, SUBREDDIT_TO_ANALYZE)
+    with metrics.stage('posting_times') as stage:
+        hourly_stats, daily_stats = analyze_posting_times(analysis_df, subreddit_name)
+        stage.rows = len(analysis_df)
     
     # Generate recommendations
-    generate_actionable_recommendations(df, hourly_stats, daily_stats, SUBREDDIT_TO_ANALYZE)
+    with metrics.stage('recommendations') as stage:
+        generate_actionable_recommendations(analysis_df, hourly_stats, daily_stats, subreddit_name)
+        stage.rows = len(analysis_df)
     
     # Save results
-    save_results(df, hourly_stats, daily_stats, SUBREDDIT_TO_ANALYZE)
+    with metrics.stage('save') as stage:
+        save_results(df, hourly_stats, daily_stats, subreddit_name)
+        stage.rows = len(df)
+    
+    metrics.print_summary()
+    if metrics_dir is not None:
+        json_file, prom_file = metrics.save()
+        print(f"   📁 Run metrics: {json_file}, {prom_file}")
     
     print("\n" + "="*70)
     print("✅ ANALYSIS COMPLETE!")
-    print(f"📊 Analyzed {len(df)} posts from r/{SUBREDDIT_TO_ANALYZE}")
-    print(f"📈 Data covers {df['created_datetime'].min().date()} to {df['created_datetime'].max().date()}")
-    print(f"⭐ Average engagement score: {df['engagement_score'].mean():.1f}")
+    print(f"📊 Analyzed {len(analysis_df)} posts from r/{subreddit_name}")
+    print(f"📈 Data covers {analysis_df['created_datetime'].min().date()} to {analysis_df['created_datetime'].max().date()}")
+    print(f"⭐ Average engagement score: {analysis_df['engagement_score'].mean():.1f}")
     
     print(f"\n🔄 NEXT STEPS:")
     print(f"   1. Review the recommendations above")
     print(f"   2. Test posting at suggested times")
     print(f"   3. Run this analysis weekly to track trends")
     print(f"   4. Experiment with different content types")
+    
+    return analysis_df
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,275 @@
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from reddit_query_api import POSTS_FILE_PATTERN, find_latest_files
+from reddit_questions import POST_CATEGORIES
+
+SAMPLE_SUBREDDIT = 'sysadmin'
+SELFTEXT_POOL_SIZE = 2000
+BOT_AUTHORS = {'AutoModerator'}
+
+
+class ListingDistribution:
+    """
+    Empirical field distributions taken from a collected posting-analysis CSV
+
+    Synthetic posts are bootstrapped row-wise from the sample so that score,
+    comments, hour, flair and stickied status stay correlated the way they
+    are in real data.
+    """
+
+    def __init__(self, sample_df, seed=0):
+        self.sample = sample_df.reset_index(drop=True)
+        self.anchor_utc = float(self.sample['created_utc'].max())
+        self.window_days = max(1, int((self.anchor_utc - self.sample['created_utc'].min()) // 86400))
+        humans = self.sample[~self.sample['author'].isin(BOT_AUTHORS) & ~self.sample['is_stickied'].astype(bool)]
+        self.author_post_counts = humans['author'].value_counts().to_numpy()
+
+        # A pool of post bodies built from the sample vocabulary plus the classifier
+        # keywords, so classify_posts does realistic matching work
+        rng = np.random.default_rng(seed)
+        keywords = [keyword for info in POST_CATEGORIES.values() for keyword in info['keywords']]
+        vocabulary = np.array(' '.join(self.sample['title'].astype(str)).lower().split() + keywords)
+        lengths = np.clip(rng.lognormal(mean=4.0, sigma=0.8, size=SELFTEXT_POOL_SIZE), 5, 600).astype(int)
+        self.selftext_pool = np.array([' '.join(rng.choice(vocabulary, size=length)) for length in lengths],
+                                      dtype=object)
+
+    @classmethod
+    def from_csv(cls, path=None, data_dir='.', subreddit=SAMPLE_SUBREDDIT, seed=0):
+        """
+        Load the newest raw data CSV collected for ``subreddit`` (or a given file)
+        """
+        if path is None:
+            path = find_latest_files(POSTS_FILE_PATTERN, data_dir).get(subreddit.lower())
+            if path is None:
+                raise FileNotFoundError(f"No r/{subreddit} raw data CSV found in {data_dir}")
+        return cls(pd.read_csv(path), seed=seed)
+
+    def sample_columns(self, count, seed=0):
+        """
+        Draw ``count`` synthetic posts as a dict of numpy columns
+        """
+        rng = np.random.default_rng(seed)
+        rows = rng.integers(0, len(self.sample), size=count)
+
+        # Keep the observed hour of day but spread posts over the observed window
+        hours = self.sample['hour'].to_numpy()[rows]
+        day_offsets = rng.integers(0, self.window_days, size=count)
+        anchor_midnight = self.anchor_utc - (self.anchor_utc % 86400)
+        created_utc = (anchor_midnight - day_offsets * 86400 + hours * 3600
+                       + rng.integers(0, 3600, size=count)).astype(float)
+
+        # Bots and stickied posts keep their author; everyone else becomes a
+        # synthetic user whose post count is drawn from the sample's
+        # posts-per-author distribution, so author repetition matches at any scale
+        authors = self.sample['author'].astype(str).to_numpy()[rows].astype(object)
+        stickied = self.sample['is_stickied'].to_numpy()[rows].astype(bool)
+        replace = ~(stickied | np.isin(authors, list(BOT_AUTHORS)))
+        num_replaced = int(replace.sum())
+        if num_replaced:
+            posts_per_author = rng.choice(self.author_post_counts, size=num_replaced)
+            num_authors = int(np.searchsorted(np.cumsum(posts_per_author), num_replaced)) + 1
+            author_ids = np.repeat(np.arange(num_authors), posts_per_author[:num_authors])[:num_replaced]
+            rng.shuffle(author_ids)
+            authors[replace] = np.char.add('user', author_ids.astype(str)).astype(object)
+
+        return {
+            'title': self.sample['title'].astype(str).to_numpy()[rows],
+            'selftext': self.selftext_pool[rng.integers(0, len(self.selftext_pool), size=count)],
+            'score': self.sample['score'].to_numpy()[rows],
+            'upvote_ratio': self.sample['upvote_ratio'].to_numpy()[rows],
+            'num_comments': self.sample['num_comments'].to_numpy()[rows],
+            'created_utc': created_utc,
+            'author': authors,
+            'is_self_post': self.sample['is_self_post'].to_numpy()[rows].astype(bool),
+            'flair': self.sample['flair'].fillna('').to_numpy()[rows],
+            'is_stickied': stickied,
+            'subreddit': self.sample['subreddit'].to_numpy()[rows]
+        }
+
+
+def generate_listing(distribution, count, seed=0, subreddit='sysadmin', id_prefix='s', after=None):
+    """
+    Build a Reddit listing JSON document with ``count`` synthetic posts
+    """
+    columns = distribution.sample_columns(count, seed)
+    children = []
+    for i in range(count):
+        post_id = f"{id_prefix}{i:x}"
+        permalink = f"/r/{subreddit}/comments/{post_id}/synthetic_post/"
+        children.append({'kind': 't3', 'data': {
+            'id': post_id,
+            'title': columns['title'][i],
+            'selftext': columns['selftext'][i] if columns['is_self_post'][i] else '',
+            'score': int(columns['score'][i]),
+            'upvote_ratio': float(columns['upvote_ratio'][i]),
+            'num_comments': int(columns['num_comments'][i]),
+            'created_utc': float(columns['created_utc'][i]),
+            'author': columns['author'][i],
+            'is_self': bool(columns['is_self_post'][i]),
+            'url': f"https://www.reddit.com{permalink}",
+            'permalink': permalink,
+            'subreddit': subreddit,
+            'link_flair_text': columns['flair'][i] or None,
+            'stickied': bool(columns['is_stickied'][i])
+        }})
+    return {'kind': 'Listing', 'data': {'after': after, 'dist': count, 'children': children}}
+
+
+def generate_frame(distribution, count, seed=0, now=None):
+    """
+    Build a DataFrame shaped like the collectors' output, with the union of the
+    columns used by the time analysis and by classify_posts
+    """
+    columns = distribution.sample_columns(count, seed)
+    created = pd.to_datetime(columns['created_utc'], unit='s')
+    now = now or pd.Timestamp.now()
+    ids = [f"s{i:x}" for i in range(count)]
+
+    return pd.DataFrame({
+        'id': ids,
+        'title': columns['title'],
+        'selftext': np.where(columns['is_self_post'], columns['selftext'], ''),
+        'score': columns['score'],
+        'upvote_ratio': columns['upvote_ratio'],
+        'num_comments': columns['num_comments'],
+        'created_utc': columns['created_utc'],
+        'created_datetime': created,
+        'created_time': created,
+        'days_ago': (now - created).days,
+        'hour': created.hour,
+        'day_of_week': created.weekday,
+        'day_name': created.day_name(),
+        'is_weekend': created.weekday >= 5,
+        'author': columns['author'],
+        'is_self_post': columns['is_self_post'],
+        'url': '',
+        'permalink': [f"https://reddit.com/r/sysadmin/comments/{post_id}/synthetic_post/" for post_id in ids],
+        'subreddit': columns['subreddit'],
+        'post_type': 'synthetic',
+        'flair': columns['flair'],
+        'is_stickied': columns['is_stickied']
+    })
+
+
+class MockRedditHandler(BaseHTTPRequestHandler):
+    """
+    Serves /r/<subreddit>/<sort>.json listings from a ListingDistribution
+
+    Optional fault injection mimics Reddit's blocking: user agents containing
+    any of ``blocked_user_agents`` get 403, every ``rate_limit_every``-th
+    request from one user agent gets 429, and ``latency`` adds a fixed delay.
+    """
+    protocol_version = 'HTTP/1.1'
+    distribution = None
+    seed = 0
+    cache = None
+    cache_lock = None
+    blocked_user_agents = ()
+    rate_limit_every = 0
+    latency = 0
+    request_counts = None
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+        user_agent = self.headers.get('User-Agent', '')
+        if any(blocked in user_agent for blocked in self.blocked_user_agents):
+            self._send(403, b'{"message": "Forbidden", "error": 403}')
+            return
+        if self.rate_limit_every:
+            with self.cache_lock:
+                self.request_counts[user_agent] = self.request_counts.get(user_agent, 0) + 1
+                count = self.request_counts[user_agent]
+            if count % self.rate_limit_every == 0:
+                self._send(429, b'{"message": "Too Many Requests", "error": 429}')
+                return
+
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        parts = parsed.path.strip('/').split('/')
+
+        if len(parts) != 3 or parts[0] != 'r' or not parts[2].endswith('.json'):
+            self._send(404, b'{"error": 404}')
+            return
+
+        subreddit, sort = parts[1], parts[2][:-len('.json')]
+        limit = int(params.get('limit', ['25'])[0])
+        period = params.get('t', [''])[0]
+        key = (subreddit, sort, period, limit)
+
+        with self.cache_lock:
+            body = self.cache.get(key)
+        if body is None:
+            # Each sort/period gets its own deterministic seed and id namespace
+            listing_key = f"{sort}|{period}"
+            listing = generate_listing(self.distribution, limit,
+                                       seed=self.seed + zlib.crc32(listing_key.encode()),
+                                       subreddit=subreddit,
+                                       id_prefix=f"{zlib.crc32(listing_key.encode()) % 1296:03x}")
+            body = json.dumps(listing).encode('utf-8')
+            with self.cache_lock:
+                self.cache[key] = body
+
+        self._send(200, body)
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockRedditServer:
+    """
+    Local Reddit JSON API stand-in running on a background thread
+
+        with MockRedditServer(distribution) as server:
+            collect_reddit_data_json('sysadmin', base_url=server.base_url, request_delay=0)
+    """
+
+    handler_class = MockRedditHandler
+
+    def __init__(self, distribution, seed=0, host='127.0.0.1', port=0, **handler_options):
+        handler = type('BoundMockRedditHandler', (self.handler_class,), {
+            'distribution': distribution,
+            'seed': seed,
+            'cache': {},
+            'cache_lock': threading.Lock(),
+            'request_counts': {},
+            **handler_options
+        })
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()